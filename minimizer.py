@@ -6,10 +6,13 @@
 
 
 import logging
+import os
+import sys
 from token import (
 	COMMENT,
 	DEDENT,
 	ENDMARKER,
+	ERRORTOKEN,
 	INDENT,
 	NEWLINE,
 	NL,
@@ -21,11 +24,25 @@ from token import (
 )
 from tokenize import generate_tokens
 from io import StringIO
-from enum import Enum, auto
+from enum import IntEnum, auto
+from functools import lru_cache
 
 
 logger = logging.getLogger(__name__)
 verbose = False
+# keywords that need surrounding whitespace, interned so lookups hash once
+_WORD_OPS = frozenset(sys.intern(op) for op in (
+	'and', 'or', 'not', 'is', 'in', 'for', 'while', 'return'
+))
+# token types whose values can end in whitespace that isn't part of the code:
+# comments keep trailing blanks from the source line and stray whitespace can 
+# come through as an error token. Other values are left alone, f-string parts 
+# (3.12+) may end in significant spaces
+_STRIPPED_TOKENS = frozenset((COMMENT, ERRORTOKEN))
+# change in bracket depth for each bracket operator
+_BRACKET_DELTA = {'(': 1, '[': 1, '{': 1, ')': -1, ']': -1, '}': -1}
+# token types that end a token group when no bracket is open
+_GROUP_TERMINATORS = frozenset((NEWLINE, NL, ENDMARKER, INDENT, DEDENT))
 
 
 # classes / helpers ############################################################
@@ -35,7 +52,7 @@ class TokenGroup(object):
 	adjacent on a line. This helps to easily remove comments, docstrings, and 
 	blank lines.
 	"""
-	class Type(Enum):
+	class Type(IntEnum):
 		UNKNOWN = auto()
 		CODE = auto()
 		CODE_INLINE_COMMENT = auto()
@@ -47,66 +64,69 @@ class TokenGroup(object):
 		DEDENT = auto()
 		EOF = auto()
 	
-	_WORD_OPS = ('and', 'or', 'not', 'is', 'in', 'for', 'while', 'return')
+	_WORD_OPS = _WORD_OPS
 	def __init__(self):
 		self._tokens = []
 		self._finalized = False
+		# also sets the transition append calls to update the type
 		self.type = TokenGroup.Type.UNKNOWN
 
 	def untokenize(self, rmwspace=False, wspace_char=' '):
 		"""Untokenize this group.
 		"""
-		ret = ''
-		prev = []
-		for tok in self._tokens:
-			if tok[0] != NEWLINE and tok[0] != NL:
-				if len(prev) != 0:
-					if rmwspace:
-						is_prefixed_string = tok[0] == STRING and not tok[1].startswith(('\'', '"'))
-						if (prev[0] in (NAME, NUMBER) and tok[0] in (NAME, NUMBER)) or \
-							 (prev[0] == OP and tok[1] in self._WORD_OPS) or \
-							 (tok[0] in (OP, STRING) and prev[1] in self._WORD_OPS) or \
-							 (prev[0] == NAME and is_prefixed_string):
-							ret = ''.join([ret, wspace_char])
-					else:
-						# tok[2][1]: start column, prev[3][1]: end column
-						# the difference between the two indicates whitespace
-						if prev and tok[2][1] > prev[3][1]:
-							ret = ''.join([ret, wspace_char * (tok[2][1] - prev[3][1])])
-				ret = ''.join([ret, tok[1].rstrip()])
+		# bind globals to locals, they are read for every token
+		_NEWLINE, _NL, _NAME, _NUMBER, _OP, _STRING = NEWLINE, NL, NAME, NUMBER, OP, STRING
+		word_ops = _WORD_OPS
+		strip_types = _STRIPPED_TOKENS
+		parts = []
+		prev = None
+		# both loops rstrip only the token types in strip_types, see _STRIPPED_TOKENS
+		# pick the whitespace strategy once instead of on every token
+		if rmwspace:
+			for tok in self._tokens:
+				if tok[0] == _NEWLINE or tok[0] == _NL:
+					continue
+				# the prefixed string check is the most expensive, so it goes last
+				if prev is not None and (
+						(prev[0] in (_NAME, _NUMBER) and tok[0] in (_NAME, _NUMBER)) or
+						(prev[0] == _OP and tok[1] in word_ops) or
+						(tok[0] in (_OP, _STRING) and prev[1] in word_ops) or
+						(prev[0] == _NAME and tok[0] == _STRING and
+							not tok[1].startswith(('\'', '"')))):
+					parts.append(wspace_char)
+				parts.append(tok[1].rstrip() if tok[0] in strip_types else tok[1])
+				prev = tok
+		else:
+			for tok in self._tokens:
+				if tok[0] == _NEWLINE or tok[0] == _NL:
+					continue
+				# tok[2][1]: start column, prev[3][1]: end column
+				# the difference between the two indicates whitespace
+				if prev is not None and tok[2][1] > prev[3][1]:
+					gap = tok[2][1] - prev[3][1]
+					# a single character gap is by far the most common
+					parts.append(wspace_char if gap == 1 else wspace_char * gap)
+				parts.append(tok[1].rstrip() if tok[0] in strip_types else tok[1])
 				prev = tok
-		return ret
+		return ''.join(parts)
 		
 	def append(self, tok):
 		"""Append a token to this group. Will update the group type as needed.
 		"""
-		def get_type(t):
-			if t[0] == NAME or tok[0] == OP:
-				return TokenGroup.Type.CODE
-			elif t[0] == COMMENT:
-				if t[1].startswith('#!'):
-					return TokenGroup.Type.SHEBANG
-				return TokenGroup.Type.COMMENT
-			elif t[0] == STRING:
-				return TokenGroup.Type.DOCSTRING
-			elif t[0] == NL:
-				return TokenGroup.Type.BLANK_LINE
-			elif t[0] == INDENT:
-				return TokenGroup.Type.INDENT
-			elif t[0] == DEDENT:
-				return TokenGroup.Type.DEDENT
-			elif t[0] == ENDMARKER:
-				return TokenGroup.Type.EOF
-		# function body #
 		self._tokens.append(tok)
-		if self.type == TokenGroup.Type.UNKNOWN:
-			self.type = get_type(tok)
-		elif self.type == TokenGroup.Type.CODE and tok[0] == COMMENT:
-			self.type = TokenGroup.Type.CODE_INLINE_COMMENT
-		elif self.type == TokenGroup.Type.BLANK_LINE:
-			self.type = get_type(tok)
-		elif self.type == TokenGroup.Type.DOCSTRING and tok[0] not in (STRING, NEWLINE):
-			self.type = get_type(tok)
+		self._transition(self, tok)
+		
+	@property
+	def type(self):
+		"""The group type. Setting it also selects the transition append uses to 
+		update the type, so the two can't get out of sync.
+		"""
+		return self._type
+		
+	@type.setter
+	def type(self, grp_type):
+		self._type = grp_type
+		self._transition = _TYPE_TRANSITIONS.get(grp_type, _no_transition)
 			
 	def __str__(self):
 		"""Prints TokenGroup information for easier debugging.
@@ -122,57 +142,159 @@ class TokenGroup(object):
 		)
 		
 
+# group type of a token group, keyed by the type of the token that decides it
+_TOK_TO_GROUP_TYPE = {
+	NAME: TokenGroup.Type.CODE,
+	OP: TokenGroup.Type.CODE,
+	COMMENT: TokenGroup.Type.COMMENT,
+	STRING: TokenGroup.Type.DOCSTRING,
+	NL: TokenGroup.Type.BLANK_LINE,
+	INDENT: TokenGroup.Type.INDENT,
+	DEDENT: TokenGroup.Type.DEDENT,
+	ENDMARKER: TokenGroup.Type.EOF
+}
+
+# group types removed when every removal is enabled
+_REMOVED_BY_DEFAULT = frozenset((
+	TokenGroup.Type.BLANK_LINE,
+	TokenGroup.Type.COMMENT,
+	TokenGroup.Type.DOCSTRING
+))
+
+
+def _group_type(tok):
+	"""Returns the group type a token implies, or None if it doesn't imply one.
+	"""
+	grp_type = _TOK_TO_GROUP_TYPE.get(tok[0])
+	if grp_type is TokenGroup.Type.COMMENT and tok[1].startswith('#!'):
+		return TokenGroup.Type.SHEBANG
+	return grp_type
+	
+
+# type transitions, called by TokenGroup.append with the token just appended
+def _reclassify(grp, tok):
+	"""Unknown groups and blank lines take the type of the next token.
+	"""
+	grp.type = _group_type(tok)
+	
+
+def _code_transition(grp, tok):
+	"""Code only changes type when followed by an inline comment.
+	"""
+	if tok[0] == COMMENT:
+		grp.type = TokenGroup.Type.CODE_INLINE_COMMENT
+	
+
+def _docstring_transition(grp, tok):
+	"""A string followed by anything other than a string or newline isn't a docstring.
+	"""
+	if tok[0] != STRING and tok[0] != NEWLINE:
+		grp.type = _group_type(tok)
+	
+
+def _no_transition(grp, tok):
+	"""All other group types are final.
+	"""
+	pass
+	
+
+_TYPE_TRANSITIONS = {
+	TokenGroup.Type.UNKNOWN: _reclassify,
+	TokenGroup.Type.BLANK_LINE: _reclassify,
+	TokenGroup.Type.CODE: _code_transition,
+	TokenGroup.Type.DOCSTRING: _docstring_transition
+}
+
+
 # module functions #############################################################
 def group_tokens(sbuf):
 	"""Groups tokens by line. Splits indents and dedents into their own group.
 	"""
+	# bind globals to locals, they are read for every token
+	_OP = OP
+	bracket_delta = _BRACKET_DELTA.get
+	terminators = _GROUP_TERMINATORS
+	# checked once, formatting a group is expensive
+	debug = verbose > 1 and logger.isEnabledFor(logging.DEBUG)
 	io_wrapper = StringIO(sbuf)
 	groups = []
+	groups_append = groups.append
 	group = TokenGroup()
+	group_append = group.append
 	bracket_ctr = 0
 	for tok in generate_tokens(io_wrapper.readline):
-		if tok[0] == OP and tok[1] in ('(', '[', '{'):
-			bracket_ctr += 1
-		elif tok[0] == OP and tok[1] in (')', ']', '}'):
-			bracket_ctr -= 1
+		tok_type = tok[0]
+		if tok_type == _OP:
+			bracket_ctr += bracket_delta(tok[1], 0)
+			group_append(tok)
 		# if we have a bracket that isn't closed, keep the group open
-		if tok[0] in (NEWLINE, NL, ENDMARKER, INDENT, DEDENT) and bracket_ctr == 0:
-			group.append(tok)
-			groups.append(group)
-			if verbose > 1:
-				logger.debug('Closed token group: {}'.format(group))
+		elif bracket_ctr == 0 and tok_type in terminators:
+			group_append(tok)
+			groups_append(group)
+			if debug:
+				logger.debug('Closed token group: %s', group)
 			group = TokenGroup()
+			group_append = group.append
 		else:
-			group.append(tok)
+			group_append(tok)
 	return groups
 	
 
-def untokenize(tgroups, rmwspace=False, wspace_char = ' ', indent_char='\t'):
-	"""Untokenizes groups of tokens into a string.
+# minimize is often called on the same source with different options, so keep the 
+# groups of recent sources around. Nothing downstream modifies them. Only minimize 
+# uses this, one-shot callers like minimize_to and the command line shouldn't pay 
+# for holding up to 32 sources in memory.
+_group_tokens_cached = lru_cache(maxsize=32)(group_tokens)
+	
+
+def untokenize_to(tgroups, out_write, rmwspace=False, wspace_char=' ', indent_char='\t'):
+	"""Untokenizes groups of tokens, passing the result to out_write piece by 
+	piece (e.g. the write method of a file) instead of building a string.
 	Can optionally remove whitespace and change the whitespace and indent character.
 	"""
-	ret = []
+	indent_type = TokenGroup.Type.INDENT
+	dedent_type = TokenGroup.Type.DEDENT
+	eof_type = TokenGroup.Type.EOF
+	# indent strings are only built when a level is first reached
+	indent_cache = ['']
 	indent_lvl = 0
+	indent = ''
+	newline = ''
 	for grp in tgroups:
-		if grp.type == TokenGroup.Type.INDENT:
+		if grp.type == indent_type:
 			indent_lvl += 1
+			if indent_lvl == len(indent_cache):
+				indent_cache.append(indent + indent_char)
+			indent = indent_cache[indent_lvl]
 			continue
-		elif grp.type == TokenGroup.Type.DEDENT:
+		elif grp.type == dedent_type:
 			indent_lvl -= 1
+			indent = indent_cache[indent_lvl]
 			continue
-		elif grp.type == TokenGroup.Type.EOF:
+		elif grp.type == eof_type:
 			continue
-		ret.append(
-			''.join([indent_char * indent_lvl, grp.untokenize(rmwspace, wspace_char)])
-		)
-	return '\n'.join(ret)
+		# lines are separated, not terminated, by a newline
+		out_write(newline)
+		out_write(indent)
+		out_write(grp.untokenize(rmwspace, wspace_char))
+		newline = '\n'
+	
+
+def untokenize(tgroups, rmwspace=False, wspace_char = ' ', indent_char='\t'):
+	"""Untokenizes groups of tokens into a string.
+	Can optionally remove whitespace and change the whitespace and indent character.
+	"""
+	out = []
+	untokenize_to(tgroups, out.append, rmwspace, wspace_char, indent_char)
+	return ''.join(out)
 	
 
 def remove_blank_lines(token_groups):
 	"""Removes blank lines from the token groups.
 	"""
 	base_len = len(token_groups)
-	ret = [grp for grp in token_groups if grp.type != TokenGroup.Type.BLANK_LINE]
+	blank_line = TokenGroup.Type.BLANK_LINE
+	ret = [grp for grp in token_groups if grp.type != blank_line]
 	if verbose > 0:
 		logger.info('Removed {} blank lines'.format(base_len - len(ret)))
 	return ret
@@ -182,54 +304,169 @@ def remove_docstrings(token_groups):
 	"""Removes docstrings from the token groups.
 	"""
 	base_len = len(token_groups)
-	ret = [grp for grp in token_groups if grp.type != TokenGroup.Type.DOCSTRING]
+	docstring = TokenGroup.Type.DOCSTRING
+	ret = [grp for grp in token_groups if grp.type != docstring]
 	if verbose > 0:
 		logger.info('Removed {} docstrings'.format(base_len - len(ret)))
 	return ret
 	
 
+def _strip_inline_comments(grp):
+	"""Returns a copy of a token group without its inline comment, along with the 
+	number of comments removed. The original group is left untouched.
+	"""
+	group = TokenGroup()
+	group._tokens = [tok for tok in grp._tokens if tok[0] != COMMENT]
+	group.type = TokenGroup.Type.CODE
+	return group, len(grp._tokens) - len(group._tokens)
+	
+
 def remove_comments(token_groups):
 	"""Removes comment lines and inline comments from the token groups.
 	"""
 	base_len = len(token_groups)
+	inline_comment = TokenGroup.Type.CODE_INLINE_COMMENT
 	inline_comment_ctr = 0
 	tmp = []
 	for grp in token_groups:
-		if grp.type == TokenGroup.Type.CODE_INLINE_COMMENT:
-			group = TokenGroup()
-			for tok in grp._tokens:
-				if tok[0] != COMMENT:
-					group.append(tok)
-					inline_comment_ctr += 1
+		if grp.type == inline_comment:
+			group, removed_ctr = _strip_inline_comments(grp)
+			inline_comment_ctr += removed_ctr
 			tmp.append(group)
 		else:
 			tmp.append(grp)
-	ret = [grp for grp in tmp if grp.type != TokenGroup.Type.COMMENT]
+	comment = TokenGroup.Type.COMMENT
+	ret = [grp for grp in tmp if grp.type != comment]
 	if verbose > 0:
 		logger.info('Removed {} comments and {} inline comments'.format(
 			base_len - len(ret), inline_comment_ctr))
 	return ret
 	
 
-def minimize(sbuf, rm_blank_lines=True, rm_comments=True, rm_docstrings=True, rm_whitespace=True, whitespace_char=' ', indent_char='\t'):
-	"""Convenience function for performing all the possible minimization functions.
+def _filter_all_groups(token_groups):
+	"""filter_groups specialized for the default of removing everything without 
+	counting, so the loop has no flag checks.
+	"""
+	removed = _REMOVED_BY_DEFAULT
+	inline_comment = TokenGroup.Type.CODE_INLINE_COMMENT
+	ret = []
+	ret_append = ret.append
+	for grp in token_groups:
+		grp_type = grp.type
+		if grp_type in removed:
+			continue
+		if grp_type == inline_comment:
+			grp = _strip_inline_comments(grp)[0]
+		ret_append(grp)
+	return ret
+	
+
+def filter_groups(token_groups, rm_blank_lines=True, rm_comments=True, rm_docstrings=True):
+	"""Removes blank lines, comments, and docstrings from the token groups in a 
+	single pass. Equivalent to calling the individual remove functions in turn.
 	"""
-	grps = group_tokens(sbuf)
+	if rm_blank_lines and rm_comments and rm_docstrings and verbose == 0:
+		return _filter_all_groups(token_groups)
+	removed = {}
 	if rm_blank_lines:
-		grps = remove_blank_lines(grps)
+		removed[TokenGroup.Type.BLANK_LINE] = 0
 	if rm_comments:
-		grps = remove_comments(grps)
+		removed[TokenGroup.Type.COMMENT] = 0
 	if rm_docstrings:
-		grps = remove_docstrings(grps)
+		removed[TokenGroup.Type.DOCSTRING] = 0
+	inline_comment = TokenGroup.Type.CODE_INLINE_COMMENT
+	inline_comment_ctr = 0
+	ret = []
+	for grp in token_groups:
+		if grp.type in removed:
+			removed[grp.type] += 1
+		elif rm_comments and grp.type == inline_comment:
+			group, removed_ctr = _strip_inline_comments(grp)
+			inline_comment_ctr += removed_ctr
+			ret.append(group)
+		else:
+			ret.append(grp)
+	if verbose > 0:
+		if rm_blank_lines:
+			logger.info('Removed {} blank lines'.format(
+				removed[TokenGroup.Type.BLANK_LINE]))
+		if rm_comments:
+			logger.info('Removed {} comments and {} inline comments'.format(
+				removed[TokenGroup.Type.COMMENT], inline_comment_ctr))
+		if rm_docstrings:
+			logger.info('Removed {} docstrings'.format(
+				removed[TokenGroup.Type.DOCSTRING]))
+	return ret
+	
+
+def minimize(sbuf, rm_blank_lines=True, rm_comments=True, rm_docstrings=True, rm_whitespace=True, whitespace_char=' ', indent_char='\t'):
+	"""Convenience function for performing all the possible minimization functions.
+	"""
+	grps = filter_groups(_group_tokens_cached(sbuf), rm_blank_lines, rm_comments, rm_docstrings)
 	return untokenize(grps, rm_whitespace, whitespace_char, indent_char)
 	
 
+def minimize_to(sbuf, out_write, rm_blank_lines=True, rm_comments=True, rm_docstrings=True, rm_whitespace=True, whitespace_char=' ', indent_char='\t'):
+	"""Same as minimize, but passes the minimized code to out_write as it is 
+	produced instead of returning it. Unlike minimize, the token groups are not 
+	cached, so nothing outlives the call.
+	"""
+	grps = filter_groups(group_tokens(sbuf), rm_blank_lines, rm_comments, rm_docstrings)
+	untokenize_to(grps, out_write, rm_whitespace, whitespace_char, indent_char)
+	
+
 # execution ####################################################################
+def _read_file(path):
+	"""Reads a source file with a single read and decodes it once.
+	"""
+	fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+	try:
+		data = os.read(fd, os.fstat(fd).st_size)
+	finally:
+		os.close(fd)
+	sbuf = data.decode('utf-8')
+	if '\r' in sbuf: # match the newline translation of text mode
+		sbuf = sbuf.replace('\r\n', '\n').replace('\r', '\n')
+	return sbuf
+	
+
+def _write_minimized(sbuf, dst_path, options):
+	"""Minimizes sbuf into dst_path. The output is streamed to a temporary file 
+	that only replaces dst_path once minimizing succeeded, so a failure leaves an 
+	existing dst_path untouched.
+	"""
+	from shutil import copymode
+	tmp_path = '{}.{}.tmp'.format(dst_path, os.getpid())
+	try:
+		with open(tmp_path, 'w') as f:
+			minimize_to(sbuf, f.write, **options)
+		if os.path.exists(dst_path):
+			copymode(dst_path, tmp_path)
+		os.replace(tmp_path, dst_path)
+	except BaseException:
+		if os.path.exists(tmp_path):
+			os.remove(tmp_path)
+		raise
+	
+
+def _minimize_file(src_path, dst_path, options):
+	"""Minimizes the file at src_path into dst_path, or returns the result if 
+	dst_path is None. Lives at module level so worker processes can unpickle it.
+	"""
+	sbuf = _read_file(src_path)
+	if dst_path is None:
+		# every file is minimized once, so skip the token group cache of minimize
+		out = []
+		minimize_to(sbuf, out.append, **options)
+		return ''.join(out)
+	_write_minimized(sbuf, dst_path, options)
+	
+
 def main():
 	from argparse import ArgumentParser
-	import os
+	from concurrent.futures import ProcessPoolExecutor
+	from itertools import repeat
 	from shutil import copy2
-	import sys
 	global verbose
 	parser = ArgumentParser(
 		description='Minimizes Python code using Python\'s lexical scanning tokenize module.''',
@@ -260,19 +497,14 @@ def main():
 	logger.setLevel(logging.INFO)
 	if verbose > 1:
 		logger.setLevel(logging.DEBUG)
-	def minimize_file(path, args):
-		sbuf = ''
-		with open(path, 'r') as f:
-			sbuf = f.read()
-		return minimize(
-			sbuf,
-			args.keep_blank_lines,
-			args.keep_comments,
-			args.keep_docstrings,
-			args.keep_whitespace,
-			args.whitespace_char,
-			args.indent_char
-		)
+	options = {
+		'rm_blank_lines': args.keep_blank_lines,
+		'rm_comments': args.keep_comments,
+		'rm_docstrings': args.keep_docstrings,
+		'rm_whitespace': args.keep_whitespace,
+		'whitespace_char': args.whitespace_char,
+		'indent_char': args.indent_char
+	}
 	if args.recursive: # in_path is a directory
 		if not os.path.exists(args.in_path):
 			print('ERROR: Given in path does not exist')
@@ -286,6 +518,7 @@ def main():
 				print('ERROR: Given out path is not a directory')
 				sys.exit(-1)
 			args.out_path = os.path.normpath(args.out_path + os.sep)
+		jobs = [] # (src_path, dst_path) pairs, dst_path is None for stdout
 		for root, _, fnames in os.walk(args.in_path):
 			for fname in fnames:
 				src_path = os.path.join(root, fname)
@@ -298,16 +531,29 @@ def main():
 					if not os.path.exists(os.path.join(out_root)):
 						os.makedirs(out_root)
 					if fname.lower().endswith('.py'):
-						mini = minimize_file(src_path, args)
-						with open(dst_path, 'w') as f:
-							f.write(mini)
+						jobs.append((src_path, dst_path))
 					else:
 						copy2(src_path, dst_path)
 				elif fname.lower().endswith('.py'):
+					jobs.append((src_path, None))
+		src_paths = [src_path for src_path, _ in jobs]
+		dst_paths = [dst_path for _, dst_path in jobs]
+		def print_results(results):
+			# consuming every result also raises any error from the workers
+			for src_path, dst_path, mini in zip(src_paths, dst_paths, results):
+				if dst_path is None:
 					print('{}:'.format(src_path))
-					mini = minimize_file(src_path, args)
-
 					print('{}\n'.format(mini))
+		# files are independent, so minimize them in parallel unless we need 
+		# readable logs from a single process or there is nothing to gain
+		workers = min(len(jobs), os.cpu_count() or 1)
+		if verbose > 0 or workers < 2:
+			results = map(_minimize_file, src_paths, dst_paths, repeat(options))
+			print_results(results)
+		else:
+			with ProcessPoolExecutor(max_workers=workers) as pool:
+				results = pool.map(_minimize_file, src_paths, dst_paths, repeat(options))
+				print_results(results)
 	else: # in_path is a single file
 		if not os.path.exists(args.in_path):
 			print('ERROR: Given in path does not exist')
@@ -315,15 +561,14 @@ def main():
 		if not os.path.isfile(args.in_path):
 			print('ERROR: Given in path is not a file')
 			sys.exit(-1)
-		mini = minimize_file(args.in_path, args)
 		if args.out_path:
 			if os.path.exists(args.out_path) and not os.path.isfile(args.out_path):
 				print('ERROR: Given out path is not a file')
 				sys.exit(-1)
-			with open(args.out_path, 'w') as f:
-				f.write(mini)
+			_write_minimized(_read_file(args.in_path), args.out_path, options)
 		else:
-			print(mini)
+			minimize_to(_read_file(args.in_path), sys.stdout.write, **options)
+			sys.stdout.write('\n')
 			
 
 if __name__ == '__main__':
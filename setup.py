@@ -3,12 +3,53 @@
 
 
 from setuptools import setup
-import os.path
+from pathlib import Path
+import mmap
+import os
+import sys
 
 
-base = os.path.dirname(__file__)
-with open(os.path.join(base, 'README.md'), 'r') as f:
-	desc = f.read()
+_README = Path(__file__).with_name('README.md')
+
+
+# distutils display options that only print a metadata field and exit. Every 
+# command, including egg_info and dist_info whose metadata pip reuses for the 
+# wheel, needs the long description.
+_QUERY_OPTIONS = {
+	'--name', '--version', '--fullname', '--author', '--author-email',
+	'--maintainer', '--maintainer-email', '--contact', '--contact-email', '--url',
+	'--license', '--licence', '--description', '--keywords', '--platforms',
+	'--classifiers', '--provides', '--requires', '--obsoletes', '--help',
+	'--help-commands', '-h'
+}
+
+
+def _load_desc():
+	with open(_README, 'rb') as f:
+		if os.fstat(f.fileno()).st_size == 0: # empty files can't be mapped
+			return ''
+		# map the file and decode it in one go instead of through text mode
+		with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+			return mm[:].decode('utf-8')
+
+
+_CLASSIFIERS = (
+	'Development Status :: 5 - Production/Stable',
+	'Intended Audience :: Developers',
+	'Environment :: Console',
+	'Topic :: Software Development :: Build Tools', # sorta...
+	'Topic :: Software Development :: Libraries :: Python Modules',
+	'License :: OSI Approved :: MIT License',
+	'Programming Language :: Python :: 3',
+	'Programming Language :: Python :: 3.8'
+)
+
+
+# pure queries like --name or --version skip reading the README
+if len(sys.argv) > 1 and _QUERY_OPTIONS.issuperset(sys.argv[1:]):
+	desc = ''
+else:
+	desc = _load_desc()
 
 
 setup(
@@ -20,16 +61,7 @@ setup(
   url = 'https://github.com/agroden/python-minimizer',
   author = 'Alexander Groden',
   author_email = 'alexander.groden@gmail.com',
-  classifiers = [
-  	'Development Status :: 5 - Production/Stable',
-  	'Intended Audience :: Developers',
-  	'Environment :: Console',
-  	'Topic :: Software Development :: Build Tools', # sorta...
-  	'Topic :: Software Development :: Libraries :: Python Modules',
-  	'License :: OSI Approved :: MIT License',
-    'Programming Language :: Python :: 3',
-    'Programming Language :: Python :: 3.8'
-  ],
+  classifiers = list(_CLASSIFIERS), # setuptools warns about anything but a list
   keywords = 'minimization minification minimize minify mit-license',
   py_modules = ['minimizer'],
   entry_points={